@@ -1,10 +1,12 @@
 import os
-import json
 import sqlite3
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import uuid
 
+import orjson
+import zstandard as zstd
 from flask import Flask, render_template, request, redirect, url_for, flash, g, session
-from werkzeug.utils import secure_filename
 
 from config import Config
 from services.parser import extract_text, allowed_file
@@ -19,12 +21,79 @@ app.config.from_object(Config)
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Background workers that parse and analyze uploads off the request thread
+executor = ThreadPoolExecutor(max_workers=app.config['ANALYSIS_WORKERS'])
+# Gemini calls run on their own pool so an analysis worker can wait on one
+# without starving the pool it is running on (at most one call per worker)
+ai_executor = ThreadPoolExecutor(max_workers=app.config['ANALYSIS_WORKERS'])
+
+
+# Per-connection SQLite tuning (journal_mode=WAL persists in the file, see init_db)
+SQLITE_PRAGMAS = '''
+    PRAGMA synchronous=NORMAL;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-64000;
+'''
+
+
+INSERT_META_SQL = '''
+    INSERT INTO analyses_meta (session_id, resume_filename, display_filename)
+    VALUES (?, ?, ?)
+'''
+
+# Both only apply to a pending row, so a job that already timed out stays failed
+COMPLETE_META_SQL = '''
+    UPDATE analyses_meta SET match_score = ?, status = 'done'
+    WHERE id = ? AND status = 'pending'
+'''
+
+FAIL_META_SQL = '''
+    UPDATE analyses_meta SET status = 'error', error = ?
+    WHERE id = ? AND status = 'pending'
+'''
+
+# Fails a job that has been pending too long (e.g. its worker died in a restart)
+EXPIRE_PENDING_SQL = '''
+    UPDATE analyses_meta SET status = 'error', error = ?
+    WHERE id = ? AND status = 'pending' AND created_at < datetime('now', ?)
+'''
+
+INSERT_PAYLOAD_SQL = '''
+    INSERT INTO analyses_payload
+    (id, resume_text, job_description, analysis_data, ai_analysis, suggestions)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+# zstd level for stored resume text and JSON blobs
+ZSTD_LEVEL = 3
+
+
+def compress_text(text):
+    """Compress a string for storage in a BLOB column"""
+    # One-shot zstd.compress, since compressor objects can't be shared across workers
+    return zstd.compress(text.encode('utf-8'), ZSTD_LEVEL)
+
+
+def compress_json(obj):
+    """Serialize and compress an object for a BLOB column"""
+    # orjson already produces UTF-8 bytes, so there is no str round-trip
+    return zstd.compress(orjson.dumps(obj), ZSTD_LEVEL)
+
+
+def decompress_json(blob):
+    """Inverse of compress_json; orjson parses the decompressed bytes directly"""
+    return orjson.loads(zstd.decompress(blob))
+
 
 # Database helper functions
 def get_db():
     if 'db' not in g:
-        g.db = sqlite3.connect('database.db')
+        # Autocommit mode: writes manage their own transactions (see save_analysis)
+        g.db = sqlite3.connect('database.db', isolation_level=None)
         g.db.row_factory = sqlite3.Row
+        g.db.executescript(SQLITE_PRAGMAS)
     return g.db
 
 
@@ -38,21 +107,184 @@ def close_db(exception):
 def init_db():
     """Initialize the database with required tables"""
     db = get_db()
+    # WAL lets /history reads proceed while /analyze writes
+    db.execute('PRAGMA journal_mode=WAL')
+    # Small per-analysis metadata, the only table /history needs to read
     db.execute('''
-        CREATE TABLE IF NOT EXISTS analyses (
+        CREATE TABLE IF NOT EXISTS analyses_meta (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             session_id TEXT,
             resume_filename TEXT NOT NULL,
-            resume_text TEXT NOT NULL,
-            job_description TEXT NOT NULL,
+            display_filename TEXT,
             match_score REAL,
-            analysis_data TEXT,
-            ai_analysis TEXT,
-            suggestions TEXT,
+            status TEXT NOT NULL DEFAULT 'pending',
+            error TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
-    db.commit()
+    # Large text/JSON payload, only read when a single result is shown
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS analyses_payload (
+            id INTEGER PRIMARY KEY REFERENCES analyses_meta (id),
+            resume_text BLOB NOT NULL,
+            job_description TEXT NOT NULL,
+            analysis_data BLOB,
+            ai_analysis BLOB,
+            suggestions BLOB
+        )
+    ''')
+    db.execute('''
+        CREATE INDEX IF NOT EXISTS idx_analyses_meta_session
+        ON analyses_meta (session_id, created_at DESC)
+    ''')
+    migrate_legacy_analyses(db)
+
+
+def migrate_legacy_analyses(db):
+    """One-time move of rows from the old single `analyses` table into the split tables"""
+    # Checked inside the write transaction so concurrent app processes can't both copy
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        legacy = db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'analyses'"
+        ).fetchone()
+        if legacy:
+            # Ids are kept so existing /results links still work; old stored
+            # names carry a 16-character timestamp prefix
+            db.execute('''
+                INSERT INTO analyses_meta
+                (id, session_id, resume_filename, display_filename, match_score, status, created_at)
+                SELECT id, session_id, resume_filename,
+                       CASE WHEN length(resume_filename) > 16
+                            THEN substr(resume_filename, 17) ELSE resume_filename END,
+                       match_score, 'done', created_at
+                FROM analyses
+            ''')
+            # Legacy payloads are plain JSON text; compressing that text as-is
+            # gives the same BLOBs compress_json would
+            rows = db.execute('''
+                SELECT id, resume_text, job_description, analysis_data, ai_analysis, suggestions
+                FROM analyses
+            ''')
+            db.executemany(INSERT_PAYLOAD_SQL, (
+                (
+                    row['id'],
+                    compress_text(row['resume_text']),
+                    row['job_description'],
+                    *(compress_text(value) if value else None for value in (
+                        row['analysis_data'], row['ai_analysis'], row['suggestions']
+                    ))
+                )
+                for row in rows.fetchall()
+            ))
+            # The uncompressed originals would otherwise stay in the file for good
+            db.execute('DROP TABLE analyses')
+        db.execute('COMMIT')
+    except Exception:
+        db.execute('ROLLBACK')
+        raise
+
+
+def create_analysis(db, session_id, filename, display_filename):
+    """Record a pending analysis and return its id"""
+    return db.execute(INSERT_META_SQL, (session_id, filename, display_filename)).lastrowid
+
+
+def complete_analysis(db, analysis_id, match_score, payload):
+    """
+    Store the results of an analysis in a single write transaction
+
+    Args:
+        db: Connection from get_db()
+        analysis_id: Id returned by create_analysis()
+        match_score: Overall match score
+        payload: (resume_text, job_description, analysis_data, ai_analysis, suggestions)
+
+    Returns:
+        bool: False if the analysis was no longer pending (it timed out), in
+        which case nothing is stored
+    """
+    # Take the write lock up front instead of upgrading a read lock mid-transaction
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        if not db.execute(COMPLETE_META_SQL, (match_score, analysis_id)).rowcount:
+            db.execute('ROLLBACK')
+            return False
+        db.execute(INSERT_PAYLOAD_SQL, (analysis_id, *payload))
+        db.execute('COMMIT')
+        return True
+    except Exception:
+        # Also covers a failed COMMIT, so the connection never stays mid-transaction
+        if db.in_transaction:
+            db.execute('ROLLBACK')
+        raise
+
+
+def process_analysis(analysis_id, filepath, job_description):
+    """Parse, analyze and store an uploaded resume (runs on the executor)"""
+    with app.app_context():
+        try:
+            db = get_db()
+
+            # Extract text from resume
+            resume_text = extract_text(filepath)
+
+            if not resume_text.strip():
+                db.execute(FAIL_META_SQL, (
+                    'Could not extract text from the resume. Please ensure it contains readable text.',
+                    analysis_id
+                ))
+                os.remove(filepath)
+                return
+
+            # Basic keyword analysis
+            analysis = analyze_resume(resume_text, job_description)
+
+            # AI-powered analysis (if API key is configured); the network call
+            # overlaps with the rule-based suggestions below
+            ai_future = None
+            if is_ai_available():
+                ai_future = ai_executor.submit(
+                    get_ai_analysis, resume_text, job_description, analysis
+                )
+
+            # Generate rule-based suggestions (as fallback/supplement)
+            suggestions = generate_suggestions(resume_text, analysis)
+
+            ai_analysis = ai_future.result() if ai_future else None
+
+            # Save to database (resume text and JSON are zstd-compressed)
+            stored = complete_analysis(db, analysis_id, analysis['match_score'], (
+                compress_text(resume_text),
+                job_description,
+                compress_json(analysis),
+                compress_json(ai_analysis) if ai_analysis else None,
+                compress_json(suggestions)
+            ))
+            if not stored:
+                # Timed out while running; the user was told to upload again
+                os.remove(filepath)
+
+        except Exception as e:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+            # If this update fails too, the exception reaches log_analysis_failure
+            get_db().execute(FAIL_META_SQL, (f'Error processing resume: {str(e)}', analysis_id))
+
+
+def log_analysis_failure(analysis_id, future):
+    """Done callback: log an exception that escaped process_analysis and fail the row"""
+    exc = future.exception()
+    if exc is None:
+        return
+    app.logger.error('Analysis %s failed', analysis_id, exc_info=exc)
+    try:
+        with app.app_context():
+            get_db().execute(FAIL_META_SQL, (
+                'Error processing resume. Please try again.', analysis_id
+            ))
+    except Exception:
+        app.logger.exception('Could not mark analysis %s as failed', analysis_id)
 
 
 # Initialize database once at startup
@@ -102,59 +334,20 @@ def analyze():
             flash('Invalid file type. Only PDF and DOCX files are allowed.', 'danger')
             return render_template('analyze.html')
 
-        # Save file with secure filename
-        filename = secure_filename(file.filename)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
-        filename = timestamp + filename
+        # Save under a random name; the user's filename is only kept for display
+        ext = os.path.splitext(file.filename)[1].lower()
+        filename = f'{uuid.uuid4().hex}{ext}'
         filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
         file.save(filepath)
 
-        try:
-            # Extract text from resume
-            resume_text = extract_text(filepath)
-
-            if not resume_text.strip():
-                flash('Could not extract text from the resume. Please ensure it contains readable text.', 'danger')
-                os.remove(filepath)
-                return render_template('analyze.html')
-
-            # Basic keyword analysis
-            analysis = analyze_resume(resume_text, job_description)
-
-            # AI-powered analysis (if API key is configured)
-            ai_analysis = None
-            if is_ai_available():
-                ai_analysis = get_ai_analysis(resume_text, job_description, analysis)
-
-            # Generate rule-based suggestions (as fallback/supplement)
-            suggestions = generate_suggestions(resume_text, analysis)
-
-            # Save to database
-            db = get_db()
-            cursor = db.execute('''
-                INSERT INTO analyses
-                (session_id, resume_filename, resume_text, job_description, match_score,
-                 analysis_data, ai_analysis, suggestions)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                session.get('session_id'),
-                filename,
-                resume_text,
-                job_description,
-                analysis['match_score'],
-                json.dumps(analysis),
-                json.dumps(ai_analysis) if ai_analysis else None,
-                json.dumps(suggestions)
-            ))
-            db.commit()
-
-            return redirect(url_for('results', analysis_id=cursor.lastrowid))
+        # Parse and analyze in the background; the results page polls until done
+        analysis_id = create_analysis(
+            get_db(), session.get('session_id'), filename, file.filename
+        )
+        future = executor.submit(process_analysis, analysis_id, filepath, job_description)
+        future.add_done_callback(partial(log_analysis_failure, analysis_id))
 
-        except Exception as e:
-            flash(f'Error processing resume: {str(e)}', 'danger')
-            if os.path.exists(filepath):
-                os.remove(filepath)
-            return render_template('analyze.html')
+        return redirect(url_for('results', analysis_id=analysis_id))
 
     return render_template('analyze.html')
 
@@ -162,25 +355,45 @@ def analyze():
 @app.route('/results/<int:analysis_id>')
 def results(analysis_id):
     db = get_db()
+    timeout_modifier = f"-{app.config['ANALYSIS_TIMEOUT']} seconds"
     row = db.execute('''
-        SELECT * FROM analyses WHERE id = ?
-    ''', (analysis_id,)).fetchone()
+        SELECT m.id, m.resume_filename, m.display_filename, m.status, m.error, m.created_at,
+               m.created_at < datetime('now', ?) AS expired,
+               p.job_description, p.analysis_data, p.ai_analysis, p.suggestions
+        FROM analyses_meta m
+        LEFT JOIN analyses_payload p ON p.id = m.id
+        WHERE m.id = ?
+    ''', (timeout_modifier, analysis_id)).fetchone()
 
     if not row:
         flash('Analysis not found.', 'danger')
         return redirect(url_for('analyze'))
 
+    if row['status'] == 'pending':
+        # Polls stay read-only; only an overdue job takes the write lock
+        if not row['expired'] or not db.execute(EXPIRE_PENDING_SQL, (
+            'Analysis timed out. Please try again.', analysis_id, timeout_modifier
+        )).rowcount:
+            return render_template('processing.html')
+        flash('Analysis timed out. Please try again.', 'danger')
+        return redirect(url_for('analyze'))
+
+    if row['status'] == 'error':
+        flash(row['error'], 'danger')
+        return redirect(url_for('analyze'))
+
     # Load the full analysis data from JSON
-    analysis_data = json.loads(row['analysis_data'])
+    analysis_data = decompress_json(row['analysis_data'])
 
     # Load AI analysis if available
     ai_analysis = None
     if row['ai_analysis']:
-        ai_analysis = json.loads(row['ai_analysis'])
+        ai_analysis = decompress_json(row['ai_analysis'])
 
     analysis = {
         'id': row['id'],
         'resume_filename': row['resume_filename'],
+        'display_filename': row['display_filename'] or row['resume_filename'],
         'job_description': row['job_description'],
         'match_score': analysis_data.get('match_score', 0),
         'matched_skills': analysis_data.get('matched_skills', []),
@@ -194,7 +407,7 @@ def results(analysis_id):
         'jd_education': analysis_data.get('jd_education', []),
         'resume_skill_count': analysis_data.get('resume_skill_count', 0),
         'jd_skill_count': analysis_data.get('jd_skill_count', 0),
-        'suggestions': json.loads(row['suggestions']),
+        'suggestions': decompress_json(row['suggestions']),
         'ai_analysis': ai_analysis,
         'created_at': row['created_at']
     }
@@ -211,9 +424,9 @@ def history():
     db = get_db()
     # Show analyses from current session
     rows = db.execute('''
-        SELECT id, resume_filename, match_score, created_at
-        FROM analyses
-        WHERE session_id = ?
+        SELECT id, resume_filename, display_filename, match_score, created_at
+        FROM analyses_meta
+        WHERE session_id = ? AND status = 'done'
         ORDER BY created_at DESC
         LIMIT 20
     ''', (session.get('session_id'),)).fetchall()
@@ -224,6 +437,7 @@ def history():
         analyses.append({
             'id': row['id'],
             'resume_filename': row['resume_filename'],
+            'display_filename': row['display_filename'] or row['resume_filename'],
             'match_score': row['match_score'],
             'score_category': score_category,
             'score_class': score_class,
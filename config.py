@@ -10,6 +10,10 @@ class Config:
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
     MAX_CONTENT_LENGTH = 2 * 1024 * 1024  # 2MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'docx'}
+    ANALYSIS_WORKERS = 4  # background threads that parse and analyze uploads
+    # Seconds after upload before a pending analysis is reported as failed; time
+    # spent queued behind other uploads counts toward it
+    ANALYSIS_TIMEOUT = 300
 
     # Gemini API Key - set this in environment variable
     GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
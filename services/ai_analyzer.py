@@ -3,12 +3,30 @@ AI-powered resume analysis using Google Gemini
 """
 
 import os
-import json
+import hashlib
+from functools import lru_cache
+import orjson
 import google.generativeai as genai
+from diskcache import Cache
 
 # Configure Gemini
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 
+GEMINI_MODEL = 'gemini-1.5-flash'
+# JSON mode makes the model return bare JSON, without markdown fences
+GENERATION_CONFIG = {
+    'response_mime_type': 'application/json',
+    'temperature': 0.3
+}
+
+# Prompt size limits (characters) for the resume and job description
+RESUME_PROMPT_CHARS = 4000
+JD_PROMPT_CHARS = 2000
+
+# Successful Gemini responses, keyed on the prompt text, so retries skip the API call
+AI_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.ai_cache')
+AI_CACHE_TTL = 24 * 60 * 60  # seconds
+
 
 def is_ai_available():
     """Check if AI analysis is available"""
@@ -23,6 +41,31 @@ def configure_gemini():
     return False
 
 
+def _truncate_text(text, limit):
+    """Cut text to at most limit characters, preferring a paragraph or line break"""
+    if len(text) <= limit:
+        return text
+    # Only back up to a break in the last quarter, so short texts aren't gutted
+    floor = limit * 3 // 4
+    for sep in ('\n\n', '\n'):
+        cut = text.rfind(sep, floor, limit)
+        if cut != -1:
+            return text[:cut]
+    return text[:limit]
+
+
+@lru_cache(maxsize=1)
+def _get_ai_cache():
+    """Open the response cache on first use, so .ai_cache/ only exists when AI is enabled"""
+    return Cache(AI_CACHE_DIR)
+
+
+def _cache_key(prompt):
+    """Content hash of everything that determines the Gemini response"""
+    data = f'{GEMINI_MODEL}||{GENERATION_CONFIG!r}||{prompt}'.encode('utf-8')
+    return hashlib.blake2b(data).hexdigest()
+
+
 def get_ai_analysis(resume_text, job_description, basic_analysis):
     """
     Get AI-powered analysis using Google Gemini
@@ -38,16 +81,17 @@ def get_ai_analysis(resume_text, job_description, basic_analysis):
     if not configure_gemini():
         return None
 
-    try:
-        model = genai.GenerativeModel('gemini-1.5-flash')
+    resume_text = _truncate_text(resume_text, RESUME_PROMPT_CHARS)
+    job_description = _truncate_text(job_description, JD_PROMPT_CHARS)
 
+    try:
         prompt = f"""You are an expert career coach and resume analyst. Analyze this resume against the job description and provide actionable feedback.
 
 RESUME:
-{resume_text[:4000]}
+{resume_text}
 
 JOB DESCRIPTION:
-{job_description[:2000]}
+{job_description}
 
 BASIC ANALYSIS RESULTS:
 - Match Score: {basic_analysis.get('match_score', 0)}%
@@ -91,21 +135,23 @@ Provide your analysis in the following JSON format (respond ONLY with valid JSON
 }}
 """
 
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        # Key on the rendered prompt: it also carries the basic analysis results
+        key = _cache_key(prompt)
+        ai_cache = _get_ai_cache()
+        cached = ai_cache.get(key)
+        if cached is not None:
+            return cached
 
-        # Clean up response - remove markdown code blocks if present
-        if response_text.startswith('```'):
-            response_text = response_text.split('```')[1]
-            if response_text.startswith('json'):
-                response_text = response_text[4:]
-        response_text = response_text.strip()
+        model = genai.GenerativeModel(GEMINI_MODEL)
+        response = model.generate_content(prompt, generation_config=GENERATION_CONFIG)
 
         # Parse JSON response
-        ai_result = json.loads(response_text)
+        ai_result = orjson.loads(response.text)
+        # Only successful responses are cached; errors should be retried
+        ai_cache.set(key, ai_result, expire=AI_CACHE_TTL)
         return ai_result
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         print(f"JSON parsing error: {e}")
         return {
             "error": "Could not parse AI response",
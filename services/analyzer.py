@@ -1,4 +1,8 @@
 import re
+from collections import Counter
+from functools import lru_cache
+
+import ahocorasick
 
 # Skill synonyms/aliases mapping
 SKILL_ALIASES = {
@@ -88,6 +92,17 @@ SOFT_SKILLS = [
 ALL_SKILLS = (PROGRAMMING_LANGUAGES + FRAMEWORKS_LIBRARIES + DATABASES +
               CLOUD_DEVOPS + DATA_AI_ML + TOOLS_PLATFORMS + SOFT_SKILLS)
 
+# Category keys in priority order, with the skills that belong to each
+SKILL_CATEGORIES = (
+    ('programming', PROGRAMMING_LANGUAGES),
+    ('frameworks', FRAMEWORKS_LIBRARIES),
+    ('databases', DATABASES),
+    ('cloud_devops', CLOUD_DEVOPS),
+    ('data_ai', DATA_AI_ML),
+    ('tools', TOOLS_PLATFORMS),
+    ('soft_skills', SOFT_SKILLS),
+)
+
 # Experience level keywords
 EXPERIENCE_LEVELS = {
     'entry': ['entry level', 'junior', 'associate', 'intern', 'internship',
@@ -108,13 +123,81 @@ EDUCATION_KEYWORDS = {
 }
 
 
+# Patterns used to normalize text before skill matching
+# ASCII separators and stray symbols -> space in one str.translate pass; this is
+# every ASCII character outside [\w\s.+#], which covers the separators too.
+# A full 128-char table (not a sparse dict) keeps translate on its ASCII fast path.
+_NON_SKILL_CHAR_TABLE = ''.join(
+    ch if ch.isalnum() or ch.isspace() or ch in '_.+#' else ' '
+    for ch in map(chr, range(128))
+)
+# Non-ASCII symbols (bullets, dashes, ...) still need the Unicode-aware class
+_NON_SKILL_CHAR_RE = re.compile(r'[^\w\s\.\+\#]')
+
+# "3 years", "3+ years" and "3-5 years" (both ends captured) in one pass.
+# "minimum 3 years" needs no branch of its own: the number is matched anyway.
+_YEARS_RE = re.compile(r'(\d+)(?:\s*-\s*(\d+)|\+)?\s*(?:years?|yrs?)')
+
+
+def _build_level_automaton(levels):
+    """Build an Aho-Corasick automaton mapping each keyword to its level"""
+    automaton = ahocorasick.Automaton()
+    for level, keywords in levels.items():
+        for keyword in keywords:
+            automaton.add_word(keyword, level)
+    automaton.make_automaton()
+    return automaton
+
+
+_EXPERIENCE_AUTOMATON = _build_level_automaton(EXPERIENCE_LEVELS)
+_EDUCATION_AUTOMATON = _build_level_automaton(EDUCATION_KEYWORDS)
+
+# Lowercase skill -> skill as listed above
+_ORIGINAL_CASE = {skill.lower(): skill for skill in ALL_SKILLS}
+
+# Lowercase skill -> category key (built in reverse so the first category listed wins)
+_CATEGORY_OF = {
+    skill.lower(): category
+    for category, skills in reversed(SKILL_CATEGORIES)
+    for skill in skills
+}
+
+
+def _build_skill_automaton():
+    """
+    Build one Aho-Corasick automaton over every skill and alias
+
+    Keywords are padded with spaces so the automaton itself only reports
+    whole-word matches in preprocessed text.
+    """
+    targets = {}
+    for skill in ALL_SKILLS:
+        targets.setdefault(skill.lower(), []).append(skill)
+    for alias, canonical in SKILL_ALIASES.items():
+        if canonical in ALL_SKILLS:
+            targets.setdefault(alias, []).append(canonical)
+
+    automaton = ahocorasick.Automaton()
+    for keyword, skills in targets.items():
+        automaton.add_word(f' {keyword} ', tuple(skills))
+    automaton.make_automaton()
+    return automaton
+
+
+_SKILL_AUTOMATON = _build_skill_automaton()
+
+
+def _preprocess_lowered(text):
+    """Strip separators and stray symbols from already-lowercased text"""
+    text = text.translate(_NON_SKILL_CHAR_TABLE)
+    if not text.isascii():
+        text = _NON_SKILL_CHAR_RE.sub(' ', text)
+    return ' '.join(text.split())
+
+
 def preprocess_text(text):
     """Preprocess text for skill extraction"""
-    text = text.lower()
-    text = re.sub(r'[/\\|,;:\-\(\)\[\]\{\}]', ' ', text)
-    text = re.sub(r'[^\w\s\.\+\#]', ' ', text)
-    text = ' '.join(text.split())
-    return text
+    return _preprocess_lowered(text.lower())
 
 
 def normalize_skill(skill):
@@ -123,58 +206,91 @@ def normalize_skill(skill):
     return SKILL_ALIASES.get(skill_lower, skill_lower)
 
 
-def extract_skills(text, skill_list=None):
-    """Extract skills from text using keyword matching with alias support"""
-    if skill_list is None:
-        skill_list = ALL_SKILLS
+@lru_cache(maxsize=256)
+def _cached_skill_counts(text_lower):
+    """Scan lowercased text for skills; repeated texts are served from cache"""
+    text_processed = ' ' + _preprocess_lowered(text_lower) + ' '
+    counts = Counter()
 
-    text_processed = preprocess_text(text)
-    found_skills = set()
+    for _, skills in _SKILL_AUTOMATON.iter(text_processed):
+        counts.update(skills)
 
-    # Check for aliases in the text and map them
-    words = text_processed.split()
-    for word in words:
-        normalized = normalize_skill(word)
-        if normalized != word:
-            text_processed = text_processed + ' ' + normalized
+    return counts
 
-    for skill in skill_list:
-        skill_lower = skill.lower()
-        escaped_skill = re.escape(skill_lower)
-        pattern = r'(?:^|[\s,;:\-\(\)\[\]])' + escaped_skill + r'(?:$|[\s,;:\-\(\)\[\]])'
 
-        if re.search(pattern, ' ' + text_processed + ' '):
-            found_skills.add(skill)
+def _count_phrase(text_processed, phrase):
+    """Whole-word occurrences of phrase in space-padded, preprocessed text"""
+    padded = f' {phrase} '
+    count = 0
+    start = text_processed.find(padded)
+    while start != -1:
+        count += 1
+        # Resume on the trailing space, which may open the next occurrence
+        start = text_processed.find(padded, start + len(padded) - 1)
+    return count
 
-    return list(found_skills)
 
+def _append_alias_targets(text_processed):
+    """Append the canonical name of each single-word alias found in the text"""
+    canonicals = [
+        SKILL_ALIASES[word] for word in text_processed.split()
+        if SKILL_ALIASES.get(word, word) != word
+    ]
+    if not canonicals:
+        return text_processed
+    return ' '.join([text_processed, *canonicals])
 
-def get_skill_frequency(text, skills):
-    """Count how many times each skill appears in the text"""
-    text_processed = preprocess_text(text)
-    frequency = {}
+
+def _count_requested_skills(text, skills, expand_aliases=False):
+    """
+    Count each requested skill in the text
+
+    Skills from ALL_SKILLS come from the automaton scan (aliases included);
+    any other caller-supplied skill falls back to a whole-word search, over
+    the alias-expanded text if expand_aliases is set.
+    """
+    text_lower = text.lower()
+    counts = _cached_skill_counts(text_lower)
+    text_processed = None
+    result = {}
 
     for skill in skills:
         skill_lower = skill.lower()
-        escaped_skill = re.escape(skill_lower)
-        pattern = r'(?:^|[\s,;:\-\(\)\[\]])' + escaped_skill + r'(?:$|[\s,;:\-\(\)\[\]])'
-        matches = re.findall(pattern, ' ' + text_processed + ' ')
-        if matches:
-            frequency[skill] = len(matches)
+        if skill_lower in _ORIGINAL_CASE:
+            count = counts.get(skill_lower, 0)
+        else:
+            if text_processed is None:
+                text_processed = _preprocess_lowered(text_lower)
+                if expand_aliases:
+                    text_processed = _append_alias_targets(text_processed)
+                text_processed = f' {text_processed} '
+            count = _count_phrase(text_processed, skill_lower)
+        if count:
+            result[skill] = count
 
-    return frequency
+    return result
 
 
-def detect_experience_level(text):
-    """Detect required experience level from job description"""
-    text_lower = text.lower()
-    detected = []
+def extract_skills(text, skill_list=None):
+    """Extract skills from text using keyword matching with alias support"""
+    if skill_list is None:
+        return list(_cached_skill_counts(text.lower()))
+    return list(_count_requested_skills(text, skill_list, expand_aliases=True))
 
-    for level, keywords in EXPERIENCE_LEVELS.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                detected.append(level)
-                break
+
+def get_skill_frequency(text, skills):
+    """Count how many times each skill appears in the text"""
+    return _count_requested_skills(text, skills)
+
+
+def _detect_experience_level(text_lower):
+    """Experience level detection on already-lowercased text"""
+    detected = set()
+
+    for _, level in _EXPERIENCE_AUTOMATON.iter(text_lower):
+        detected.add(level)
+        if level == 'senior':
+            break
 
     if not detected:
         return 'not specified'
@@ -186,65 +302,51 @@ def detect_experience_level(text):
         return 'entry'
 
 
+def detect_experience_level(text):
+    """Detect required experience level from job description"""
+    return _detect_experience_level(text.lower())
+
+
+def _extract_years_experience(text_lower):
+    """Years-of-experience extraction on already-lowercased text"""
+    years = [
+        int(number)
+        for match in _YEARS_RE.finditer(text_lower)
+        for number in match.groups() if number
+    ]
+    return min(years) if years else None
+
+
 def extract_years_experience(text):
     """Extract years of experience requirement from text"""
-    text_lower = text.lower()
-    patterns = [
-        r'(\d+)\+?\s*(?:years?|yrs?)\s*(?:of)?\s*(?:experience|exp)?',
-        r'(?:minimum|at least|min)\s*(\d+)\s*(?:years?|yrs?)',
-        r'(\d+)\s*-\s*\d+\s*(?:years?|yrs?)',
-    ]
+    return _extract_years_experience(text.lower())
 
-    years = []
-    for pattern in patterns:
-        matches = re.findall(pattern, text_lower)
-        years.extend([int(m) for m in matches if m])
 
-    return min(years) if years else None
+def _detect_education_requirement(text_lower):
+    """Education requirement detection on already-lowercased text"""
+    found = set()
 
+    for _, level in _EDUCATION_AUTOMATON.iter(text_lower):
+        found.add(level)
+        if len(found) == len(EDUCATION_KEYWORDS):
+            break
 
-def detect_education_requirement(text):
-    """Detect education requirements from job description"""
-    text_lower = text.lower()
-    detected = []
+    return [level for level in EDUCATION_KEYWORDS if level in found]
 
-    for level, keywords in EDUCATION_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                detected.append(level)
-                break
 
-    return detected
+def detect_education_requirement(text):
+    """Detect education requirements from job description"""
+    return _detect_education_requirement(text.lower())
 
 
 def categorize_skills(skills):
     """Categorize skills into different categories"""
-    categories = {
-        'programming': [],
-        'frameworks': [],
-        'databases': [],
-        'cloud_devops': [],
-        'data_ai': [],
-        'tools': [],
-        'soft_skills': []
-    }
+    categories = {category: [] for category, _ in SKILL_CATEGORIES}
 
     for skill in skills:
-        skill_lower = skill.lower()
-        if skill_lower in [s.lower() for s in PROGRAMMING_LANGUAGES]:
-            categories['programming'].append(skill)
-        elif skill_lower in [s.lower() for s in FRAMEWORKS_LIBRARIES]:
-            categories['frameworks'].append(skill)
-        elif skill_lower in [s.lower() for s in DATABASES]:
-            categories['databases'].append(skill)
-        elif skill_lower in [s.lower() for s in CLOUD_DEVOPS]:
-            categories['cloud_devops'].append(skill)
-        elif skill_lower in [s.lower() for s in DATA_AI_ML]:
-            categories['data_ai'].append(skill)
-        elif skill_lower in [s.lower() for s in TOOLS_PLATFORMS]:
-            categories['tools'].append(skill)
-        elif skill_lower in [s.lower() for s in SOFT_SKILLS]:
-            categories['soft_skills'].append(skill)
+        category = _CATEGORY_OF.get(skill.lower())
+        if category:
+            categories[category].append(skill)
 
     return categories
 
@@ -263,15 +365,9 @@ def calculate_match(resume_skills, jd_skills):
 
     score = (len(matched) / len(jd_skills_set)) * 100
 
-    def get_original_case(skill_lower):
-        for s in ALL_SKILLS:
-            if s.lower() == skill_lower:
-                return s
-        return skill_lower
-
-    matched_original = [get_original_case(s) for s in matched]
-    missing_original = [get_original_case(s) for s in missing]
-    extra_original = [get_original_case(s) for s in extra]
+    matched_original = [_ORIGINAL_CASE.get(s, s) for s in matched]
+    missing_original = [_ORIGINAL_CASE.get(s, s) for s in missing]
+    extra_original = [_ORIGINAL_CASE.get(s, s) for s in extra]
 
     return round(score, 1), matched_original, missing_original, extra_original
 
@@ -283,43 +379,46 @@ def analyze_resume(resume_text, job_description):
     Returns:
         dict: Analysis results including score, skills, and metadata
     """
-    resume_skills = extract_skills(resume_text)
-    jd_skills = extract_skills(job_description)
+    # Lowercase each input once and share it between all the detectors below
+    resume_lower = resume_text.lower()
+    jd_lower = job_description.lower()
 
-    score, matched, missing, extra = calculate_match(resume_skills, jd_skills)
+    # One scan per text; the skill counts drive matching, frequency and categories.
+    # Keys are canonical (lowercase) skill names, so they're compared directly.
+    resume_counts = _cached_skill_counts(resume_lower)
+    jd_counts = _cached_skill_counts(jd_lower)
 
-    # Get skill frequency for JD to find high-priority skills
-    jd_skill_freq = get_skill_frequency(job_description, jd_skills)
+    matched = sorted(resume_counts.keys() & jd_counts.keys())
+    missing = sorted(jd_counts.keys() - resume_counts.keys())
+    extra = sorted(resume_counts.keys() - jd_counts.keys())
+    score = round(len(matched) / len(jd_counts) * 100, 1) if jd_counts else 0.0
 
     # Categorize skills
     matched_categories = categorize_skills(matched)
     missing_categories = categorize_skills(missing)
 
     # Detect experience level and education from JD
-    jd_experience_level = detect_experience_level(job_description)
-    jd_years_required = extract_years_experience(job_description)
-    jd_education = detect_education_requirement(job_description)
+    jd_experience_level = _detect_experience_level(jd_lower)
+    jd_years_required = _extract_years_experience(jd_lower)
+    jd_education = _detect_education_requirement(jd_lower)
 
     # Detect from resume
-    resume_experience_level = detect_experience_level(resume_text)
-    resume_education = detect_education_requirement(resume_text)
+    resume_experience_level = _detect_experience_level(resume_lower)
+    resume_education = _detect_education_requirement(resume_lower)
 
     # Find high-priority missing skills (mentioned multiple times in JD)
-    high_priority_missing = [
-        skill for skill in missing
-        if jd_skill_freq.get(skill, 0) >= 2
-    ]
+    high_priority_missing = [skill for skill in missing if jd_counts[skill] >= 2]
 
     return {
         'match_score': score,
-        'matched_skills': sorted(matched),
-        'missing_skills': sorted(missing),
-        'extra_skills': sorted(extra),
-        'high_priority_missing': sorted(high_priority_missing),
+        'matched_skills': matched,
+        'missing_skills': missing,
+        'extra_skills': extra,
+        'high_priority_missing': high_priority_missing,
         'matched_categories': matched_categories,
         'missing_categories': missing_categories,
-        'resume_skill_count': len(resume_skills),
-        'jd_skill_count': len(jd_skills),
+        'resume_skill_count': len(resume_counts),
+        'jd_skill_count': len(jd_counts),
         'jd_experience_level': jd_experience_level,
         'jd_years_required': jd_years_required,
         'jd_education': jd_education,
@@ -1,35 +1,36 @@
-from pypdf import PdfReader
-from docx import Document
 import os
+import threading
+
+import docx2txt
+import pypdfium2 as pdfium
+
+# PDFium is not thread-safe, and uploads are parsed on a thread pool
+_pdfium_lock = threading.Lock()
 
 
 def extract_text_from_pdf(file_path):
-    """Extract text from a PDF file using pypdf"""
-    text = ""
+    """Extract text from a PDF file using pypdfium2"""
+    parts = []
     try:
-        reader = PdfReader(file_path)
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(file_path)
+            try:
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    parts.append(textpage.get_text_bounded())
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
     except Exception as e:
         raise Exception(f"Error extracting text from PDF: {str(e)}")
-    return text.strip()
+    return "\n".join(parts).strip()
 
 
 def extract_text_from_docx(file_path):
-    """Extract text from a DOCX file using python-docx"""
-    text = ""
+    """Extract text from a DOCX file (paragraphs and tables) using docx2txt"""
     try:
-        doc = Document(file_path)
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        # Also extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text += cell.text + " "
-                text += "\n"
+        text = docx2txt.process(file_path)
     except Exception as e:
         raise Exception(f"Error extracting text from DOCX: {str(e)}")
     return text.strip()
@@ -3,6 +3,14 @@ Enhanced rule-based suggestion engine for resume improvement
 """
 
 import re
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from itertools import islice
+
+import ahocorasick
+
+from .analyzer import ALL_SKILLS
 
 # Action verbs by category
 ACTION_VERBS = {
@@ -14,89 +22,328 @@ ACTION_VERBS = {
     'analysis': ["analyzed", "evaluated", "assessed", "researched", "investigated", "identified"]
 }
 
-ALL_ACTION_VERBS = [verb for verbs in ACTION_VERBS.values() for verb in verbs]
+# Verb -> category, in listed order
+_VERB_TO_CAT = {verb: category for category, verbs in ACTION_VERBS.items() for verb in verbs}
+
+ALL_ACTION_VERBS = frozenset(_VERB_TO_CAT)
 
 # Important resume sections
 IMPORTANT_SECTIONS = ["experience", "education", "skills", "projects", "summary", "objective"]
 
-
-def check_action_verbs(resume_text):
-    """Check which action verbs are used in the resume"""
-    text_lower = resume_text.lower()
+# Online presence keywords looked for in contact info
+CONTACT_KEYWORDS = ["linkedin", "github", "portfolio", "website", "blog"]
+
+# Lower bounds of the Fair, Good and Excellent match score buckets
+SCORE_THRESHOLDS = (40, 60, 80)
+
+# Per bucket, lowest first: (label, CSS class) and the match score feedback
+_SCORE_CATEGORIES = (
+    ('Needs Work', 'danger'),
+    ('Fair', 'warning'),
+    ('Good', 'info'),
+    ('Excellent', 'success')
+)
+_MATCH_SCORE_FEEDBACK = (
+    ('danger', 'Low match ({score}%). This role may require skills you haven\'t highlighted. Consider if you have relevant experience that isn\'t reflected in your resume.'),
+    ('warning', 'Moderate match ({score}%). Consider emphasizing transferable skills and any relevant projects or coursework.'),
+    ('info', 'Good match ({score}%)! You have a solid foundation. Adding a few more relevant skills could push your application to the top.'),
+    ('success', 'Excellent match ({score}%)! Your skills align very well with this job. Focus on tailoring your experience descriptions to highlight relevant achievements.')
+)
+
+# Missing-skill categories that get their own suggestion:
+# (category key, suggestion category, suggestion type, message)
+_MISSING_CATEGORY_FEEDBACK = (
+    ('programming', 'Programming Languages', 'warning', 'Missing programming languages: {skills}. If you have experience with similar languages, highlight your ability to learn quickly.'),
+    ('frameworks', 'Frameworks', 'warning', 'Missing frameworks/libraries: {skills}. Consider adding relevant projects to demonstrate these skills.'),
+    ('cloud_devops', 'Cloud/DevOps', 'info', 'Missing cloud/DevOps skills: {skills}. Free tier accounts on AWS/Azure can help you gain hands-on experience.')
+)
+
+# Max characters between a skill and an action verb for the skill to count as in context
+CONTEXT_WINDOW = 50
+
+
+def _score_bucket(score):
+    """Index of the score bucket; a score equal to a threshold falls in the higher bucket"""
+    return bisect_right(SCORE_THRESHOLDS, score)
+
+
+def _build_keyword_automaton():
+    """Aho-Corasick automaton mapping each keyword to its (group, keyword) pair"""
+    automaton = ahocorasick.Automaton()
+    for verb in _VERB_TO_CAT:
+        automaton.add_word(verb, ('verb', verb))
+    for section in IMPORTANT_SECTIONS:
+        automaton.add_word(section, ('section', section))
+    for keyword in CONTACT_KEYWORDS:
+        automaton.add_word(keyword, ('contact', keyword))
+    automaton.make_automaton()
+    return automaton
+
+
+# Metrics in one pass. Every branch starts with a different character, so at most
+# one is tried per position; within digits the "%" and "+" forms come before bare
+# 2+ digit numbers, so e.g. "25%" is one token.
+# Compiled for bytes: every token is ASCII, and scanning UTF-8 is cheaper than str.
+_METRIC_RE = re.compile(
+    rb'\$[\d,]+'       # Dollar amounts
+    rb'|#\d+'          # Rankings
+    rb'|\d(?:\d*%'     # Percentages
+    rb'|\d*\+'         # X+ format
+    rb'|\d+)'          # Numbers with 2+ digits
+)
+
+_EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+_PHONE_RE = re.compile(r'[\+]?[\d\s\-\(\)]{10,}')
+
+# Contact details usually sit in the header, so the phone search looks here first
+_CONTACT_HEADER_CHARS = 600
+
+# Shared keyword automaton: one pass over the text finds every keyword (substring match)
+_AC = _build_keyword_automaton()
+
+
+# Everything the keyword checks need from one automaton pass: the set of
+# (group, keyword) hits and the sorted start/end offsets of every action verb
+_ScanResult = namedtuple('_ScanResult', ['hits', 'verb_starts', 'verb_ends'])
+
+
+@lru_cache(maxsize=32)
+def _scan_keywords(text_lower):
+    """Single pass over the text shared by the verb, section, contact and context checks"""
+    hits = set()
+    verb_starts = []
+    verb_ends = []
+
+    for end, pair in _AC.iter(text_lower):
+        hits.add(pair)
+        group, keyword = pair
+        if group == 'verb':
+            verb_starts.append(end - len(keyword) + 1)
+            verb_ends.append(end + 1)
+
+    return _ScanResult(frozenset(hits), tuple(sorted(verb_starts)), tuple(sorted(verb_ends)))
+
+
+def _check_action_verbs(text_lower):
+    """Action verb check on already-lowercased text"""
+    hits = _scan_keywords(text_lower).hits
+
+    # Report verbs in their listed order, as the per-verb scan did
     found = {category: [] for category in ACTION_VERBS}
-
-    for category, verbs in ACTION_VERBS.items():
-        for verb in verbs:
-            if verb in text_lower:
-                found[category].append(verb)
+    for verb, category in _VERB_TO_CAT.items():
+        if ('verb', verb) in hits:
+            found[category].append(verb)
 
     total_found = sum(len(v) for v in found.values())
     return found, total_found
 
 
-def check_quantifiable_achievements(resume_text):
-    """Check for numbers/metrics in resume"""
-    patterns = [
-        r'\d+%',           # Percentages
-        r'\$[\d,]+',       # Dollar amounts
-        r'\d+\+',          # X+ format
-        r'\d{2,}',         # Numbers with 2+ digits
-        r'#\d+',           # Rankings
-    ]
+def check_action_verbs(resume_text):
+    """Check which action verbs are used in the resume"""
+    return _check_action_verbs(resume_text.lower())
 
-    metrics = []
-    for pattern in patterns:
-        matches = re.findall(pattern, resume_text)
-        metrics.extend(matches)
 
-    return len(metrics), metrics[:10]  # Return count and first 10 examples
+def check_quantifiable_achievements(resume_text):
+    """Check for numbers/metrics in resume"""
+    # Keep the first 10 as examples and only count the rest
+    matches = _METRIC_RE.finditer(resume_text.encode('utf-8'))
+    examples = [match.group().decode('ascii') for match in islice(matches, 10)]
+    return len(examples) + sum(1 for _ in matches), examples
 
 
 def check_resume_length(resume_text):
     """Analyze resume length"""
+    # str.split() stays: it beats counting regex matches for words
     word_count = len(resume_text.split())
-    line_count = len(resume_text.split('\n'))
+    line_count = resume_text.count('\n') + 1
     return word_count, line_count
 
 
+def _check_sections(text_lower):
+    """Section check on already-lowercased text"""
+    hits = _scan_keywords(text_lower).hits
+    found = [s for s in IMPORTANT_SECTIONS if ('section', s) in hits]
+    missing = [s for s in IMPORTANT_SECTIONS if ('section', s) not in hits]
+    return found, missing
+
+
 def check_sections(resume_text):
     """Check for important resume sections"""
-    text_lower = resume_text.lower()
-    found = [s for s in IMPORTANT_SECTIONS if s in text_lower]
-    missing = [s for s in IMPORTANT_SECTIONS if s not in text_lower]
-    return found, missing
+    return _check_sections(resume_text.lower())
 
 
-def check_contact_info(resume_text):
-    """Check for contact information"""
+def _has_phone(resume_text):
+    """Phone number check; the full-text search only runs if the header has none"""
+    if _PHONE_RE.search(resume_text, 0, _CONTACT_HEADER_CHARS):
+        return True
+    if len(resume_text) <= _CONTACT_HEADER_CHARS:
+        return False
+    return bool(_PHONE_RE.search(resume_text))
+
+
+def _check_contact_info(resume_text, text_lower):
+    """Contact info check; the regexes need the original text, keywords the lowercased one"""
+    hits = _scan_keywords(text_lower).hits
     checks = {
-        'email': bool(re.search(r'[\w\.-]+@[\w\.-]+\.\w+', resume_text)),
-        'phone': bool(re.search(r'[\+]?[\d\s\-\(\)]{10,}', resume_text)),
-        'linkedin': 'linkedin' in resume_text.lower(),
-        'github': 'github' in resume_text.lower(),
-        'portfolio': any(word in resume_text.lower() for word in ['portfolio', 'website', 'blog'])
+        'email': bool(_EMAIL_RE.search(resume_text)),
+        'phone': _has_phone(resume_text),
+        'linkedin': ('contact', 'linkedin') in hits,
+        'github': ('contact', 'github') in hits,
+        'portfolio': any(('contact', word) in hits for word in ['portfolio', 'website', 'blog'])
     }
     return checks
 
 
-def check_keyword_stuffing(resume_text, skills):
-    """Check if skills are naturally integrated or just listed"""
-    text_lower = resume_text.lower()
+def check_contact_info(resume_text):
+    """Check for contact information"""
+    return _check_contact_info(resume_text, resume_text.lower())
+
 
-    # Check if skills appear in context (near action verbs) vs just listed
-    contextual_skills = 0
+def _build_skill_automaton():
+    """Aho-Corasick automaton mapping each lowercase skill to itself"""
+    automaton = ahocorasick.Automaton()
+    for skill in ALL_SKILLS:
+        automaton.add_word(skill.lower(), skill.lower())
+    automaton.make_automaton()
+    return automaton
+
+
+_SKILL_AC = _build_skill_automaton()
+
+
+def _find_skill_spans(text_lower, skills):
+    """(start, end) spans of every occurrence of each (lowercase) skill"""
+    spans = {skill: [] for skill in skills}
+
+    # Known skills come from one pass over the text; iter reports overlapping
+    # and nested occurrences, like a substring search per skill would
+    if any(skill in _SKILL_AC for skill in skills):
+        for end, skill in _SKILL_AC.iter(text_lower):
+            found = spans.get(skill)
+            if found is not None:
+                found.append((end - len(skill) + 1, end + 1))
+
+    # Caller-supplied skills outside ALL_SKILLS fall back to str.find
     for skill in skills:
-        skill_lower = skill.lower()
-        # Look for skill near action verbs (within 50 characters)
-        for verb in ALL_ACTION_VERBS:
-            pattern = f'{verb}.{{0,50}}{re.escape(skill_lower)}|{re.escape(skill_lower)}.{{0,50}}{verb}'
-            if re.search(pattern, text_lower):
-                contextual_skills += 1
-                break
+        if skill not in _SKILL_AC:
+            found = spans[skill]
+            start = text_lower.find(skill)
+            while start != -1:
+                found.append((start, start + len(skill)))
+                start = text_lower.find(skill, start + 1)
+
+    return spans
+
+
+def _near_verb(text_lower, verb_starts, verb_ends, span):
+    """Whether a verb sits within CONTEXT_WINDOW characters of span on the same line"""
+    start, end = span
+
+    # Closest verb ending before the skill; a farther one only widens the gap
+    i = bisect_right(verb_ends, start) - 1
+    if i >= 0 and start - verb_ends[i] <= CONTEXT_WINDOW:
+        if text_lower.find('\n', verb_ends[i], start) == -1:
+            return True
+
+    # Closest verb starting after the skill
+    i = bisect_left(verb_starts, end)
+    if i < len(verb_starts) and verb_starts[i] - end <= CONTEXT_WINDOW:
+        if text_lower.find('\n', end, verb_starts[i]) == -1:
+            return True
+
+    return False
+
+
+def _check_keyword_stuffing(text_lower, skills):
+    """Skills-in-context check on already-lowercased text"""
+    # Lowercase each skill once; duplicates are only scanned for once
+    skills_lower = [skill.lower() for skill in skills]
+    unique_skills = {skill for skill in skills_lower if skill}
+    if not unique_skills:
+        return 0, len(skills)
 
+    scan = _scan_keywords(text_lower)
+
+    # Skills appearing in context (near action verbs) vs just listed
+    contextual = {
+        skill for skill, spans in _find_skill_spans(text_lower, unique_skills).items()
+        if any(_near_verb(text_lower, scan.verb_starts, scan.verb_ends, span) for span in spans)
+    }
+
+    contextual_skills = sum(1 for skill in skills_lower if skill in contextual)
     return contextual_skills, len(skills)
 
 
+def check_keyword_stuffing(resume_text, skills):
+    """Check if skills are naturally integrated or just listed"""
+    return _check_keyword_stuffing(resume_text.lower(), skills)
+
+
+# Suggestions with fixed text, built once; generate_suggestions appends these
+# shared dicts, so callers must treat the returned suggestions as read-only
+_WEAK_VERBS_SUGGESTION = {
+    'type': 'warning',
+    'category': 'Action Verbs',
+    'message': 'Your resume lacks strong action verbs. Start bullet points with words like: Led, Developed, Implemented, Achieved, Optimized, Delivered.'
+}
+
+_NO_METRICS_SUGGESTION = {
+    'type': 'warning',
+    'category': 'Quantifiable Results',
+    'message': 'No metrics found! Add numbers to demonstrate impact: "Increased sales by 25%", "Reduced load time by 40%", "Managed team of 5", "Processed 10K+ records daily".'
+}
+
+_NO_EMAIL_SUGGESTION = {
+    'type': 'danger',
+    'category': 'Contact Info',
+    'message': 'No email address detected! Make sure your contact information is clearly visible at the top of your resume.'
+}
+
+_ONLINE_PRESENCE_SUGGESTION = {
+    'type': 'info',
+    'category': 'Online Presence',
+    'message': 'Consider adding LinkedIn or GitHub profiles to showcase your professional network and code samples.'
+}
+
+_SKILLS_CONTEXT_SUGGESTION = {
+    'type': 'info',
+    'category': 'Skills Integration',
+    'message': 'Your skills appear to be listed but not demonstrated in context. Show how you used each skill in your experience descriptions.'
+}
+
+_ATS_SUGGESTION = {
+    'type': 'info',
+    'category': 'ATS Optimization',
+    'message': 'For ATS compatibility: Use standard section headings, avoid tables/graphics, save as PDF, and include exact keywords from the job description.'
+}
+
+_ADVANCED_DEGREE_SUGGESTION = {
+    'type': 'info',
+    'category': 'Education',
+    'message': 'This position may prefer advanced degrees. Emphasize relevant coursework, certifications, and hands-on project experience.'
+}
+
+
+# Results of the checks that depend only on the resume text
+_TextChecks = namedtuple('_TextChecks', [
+    'text_lower', 'action_verbs', 'metrics', 'length', 'sections', 'contact_info'
+])
+
+
+@lru_cache(maxsize=128)
+def _text_checks(resume_text):
+    """Run the resume-only checks; repeated texts (e.g. a new JD) are served from cache"""
+    text_lower = resume_text.lower()
+    return _TextChecks(
+        text_lower,
+        _check_action_verbs(text_lower),
+        check_quantifiable_achievements(resume_text),
+        check_resume_length(resume_text),
+        _check_sections(text_lower),
+        _check_contact_info(resume_text, text_lower)
+    )
+
+
 def generate_suggestions(resume_text, analysis_results):
     """
     Generate comprehensive improvement suggestions
@@ -110,6 +357,9 @@ def generate_suggestions(resume_text, analysis_results):
     """
     suggestions = []
 
+    # Resume-only checks (cached); the results are shared, so they're only read here
+    checks = _text_checks(resume_text)
+
     match_score = analysis_results.get('match_score', 0)
     missing_skills = analysis_results.get('missing_skills', [])
     high_priority_missing = analysis_results.get('high_priority_missing', [])
@@ -120,30 +370,12 @@ def generate_suggestions(resume_text, analysis_results):
     jd_education = analysis_results.get('jd_education', [])
 
     # 1. Overall Match Score Feedback
-    if match_score >= 80:
-        suggestions.append({
-            'type': 'success',
-            'category': 'Match Score',
-            'message': f'Excellent match ({match_score}%)! Your skills align very well with this job. Focus on tailoring your experience descriptions to highlight relevant achievements.'
-        })
-    elif match_score >= 60:
-        suggestions.append({
-            'type': 'info',
-            'category': 'Match Score',
-            'message': f'Good match ({match_score}%)! You have a solid foundation. Adding a few more relevant skills could push your application to the top.'
-        })
-    elif match_score >= 40:
-        suggestions.append({
-            'type': 'warning',
-            'category': 'Match Score',
-            'message': f'Moderate match ({match_score}%). Consider emphasizing transferable skills and any relevant projects or coursework.'
-        })
-    else:
-        suggestions.append({
-            'type': 'danger',
-            'category': 'Match Score',
-            'message': f'Low match ({match_score}%). This role may require skills you haven\'t highlighted. Consider if you have relevant experience that isn\'t reflected in your resume.'
-        })
+    suggestion_type, message = _MATCH_SCORE_FEEDBACK[_score_bucket(match_score)]
+    suggestions.append({
+        'type': suggestion_type,
+        'category': 'Match Score',
+        'message': message.format(score=match_score)
+    })
 
     # 2. High Priority Missing Skills
     if high_priority_missing:
@@ -154,25 +386,14 @@ def generate_suggestions(resume_text, analysis_results):
         })
 
     # 3. Category-specific missing skills
-    if missing_categories.get('programming'):
+    for key, category, suggestion_type, message in _MISSING_CATEGORY_FEEDBACK:
+        missing = missing_categories.get(key)
+        if not missing:
+            continue
         suggestions.append({
-            'type': 'warning',
-            'category': 'Programming Languages',
-            'message': f'Missing programming languages: {", ".join(missing_categories["programming"][:4])}. If you have experience with similar languages, highlight your ability to learn quickly.'
-        })
-
-    if missing_categories.get('frameworks'):
-        suggestions.append({
-            'type': 'warning',
-            'category': 'Frameworks',
-            'message': f'Missing frameworks/libraries: {", ".join(missing_categories["frameworks"][:4])}. Consider adding relevant projects to demonstrate these skills.'
-        })
-
-    if missing_categories.get('cloud_devops'):
-        suggestions.append({
-            'type': 'info',
-            'category': 'Cloud/DevOps',
-            'message': f'Missing cloud/DevOps skills: {", ".join(missing_categories["cloud_devops"][:4])}. Free tier accounts on AWS/Azure can help you gain hands-on experience.'
+            'type': suggestion_type,
+            'category': category,
+            'message': message.format(skills=", ".join(missing[:4]))
         })
 
     # 4. Experience Level Match
@@ -191,13 +412,9 @@ def generate_suggestions(resume_text, analysis_results):
         })
 
     # 5. Action Verbs Check
-    verb_categories, total_verbs = check_action_verbs(resume_text)
+    verb_categories, total_verbs = checks.action_verbs
     if total_verbs < 5:
-        suggestions.append({
-            'type': 'warning',
-            'category': 'Action Verbs',
-            'message': 'Your resume lacks strong action verbs. Start bullet points with words like: Led, Developed, Implemented, Achieved, Optimized, Delivered.'
-        })
+        suggestions.append(_WEAK_VERBS_SUGGESTION)
     elif total_verbs < 10:
         weak_categories = [cat for cat, verbs in verb_categories.items() if not verbs]
         if weak_categories:
@@ -208,13 +425,9 @@ def generate_suggestions(resume_text, analysis_results):
             })
 
     # 6. Quantifiable Achievements
-    metric_count, metrics = check_quantifiable_achievements(resume_text)
+    metric_count, metrics = checks.metrics
     if metric_count == 0:
-        suggestions.append({
-            'type': 'warning',
-            'category': 'Quantifiable Results',
-            'message': 'No metrics found! Add numbers to demonstrate impact: "Increased sales by 25%", "Reduced load time by 40%", "Managed team of 5", "Processed 10K+ records daily".'
-        })
+        suggestions.append(_NO_METRICS_SUGGESTION)
     elif metric_count < 4:
         suggestions.append({
             'type': 'info',
@@ -223,7 +436,7 @@ def generate_suggestions(resume_text, analysis_results):
         })
 
     # 7. Resume Length
-    word_count, _ = check_resume_length(resume_text)
+    word_count, _ = checks.length
     if word_count < 200:
         suggestions.append({
             'type': 'warning',
@@ -238,7 +451,7 @@ def generate_suggestions(resume_text, analysis_results):
         })
 
     # 8. Sections Check
-    found_sections, missing_sections = check_sections(resume_text)
+    found_sections, missing_sections = checks.sections
     critical_missing = [s for s in missing_sections if s in ['experience', 'education', 'skills']]
     if critical_missing:
         suggestions.append({
@@ -248,57 +461,30 @@ def generate_suggestions(resume_text, analysis_results):
         })
 
     # 9. Contact Information
-    contact_info = check_contact_info(resume_text)
+    contact_info = checks.contact_info
     if not contact_info['email']:
-        suggestions.append({
-            'type': 'danger',
-            'category': 'Contact Info',
-            'message': 'No email address detected! Make sure your contact information is clearly visible at the top of your resume.'
-        })
+        suggestions.append(_NO_EMAIL_SUGGESTION)
     if not contact_info['linkedin'] and not contact_info['github']:
-        suggestions.append({
-            'type': 'info',
-            'category': 'Online Presence',
-            'message': 'Consider adding LinkedIn or GitHub profiles to showcase your professional network and code samples.'
-        })
+        suggestions.append(_ONLINE_PRESENCE_SUGGESTION)
 
     # 10. Skills in Context
     if matched_skills:
-        contextual, total = check_keyword_stuffing(resume_text, matched_skills)
+        contextual, total = _check_keyword_stuffing(checks.text_lower, matched_skills)
         if total > 0 and contextual / total < 0.3:
-            suggestions.append({
-                'type': 'info',
-                'category': 'Skills Integration',
-                'message': 'Your skills appear to be listed but not demonstrated in context. Show how you used each skill in your experience descriptions.'
-            })
+            suggestions.append(_SKILLS_CONTEXT_SUGGESTION)
 
     # 11. ATS Tips
-    suggestions.append({
-        'type': 'info',
-        'category': 'ATS Optimization',
-        'message': 'For ATS compatibility: Use standard section headings, avoid tables/graphics, save as PDF, and include exact keywords from the job description.'
-    })
+    suggestions.append(_ATS_SUGGESTION)
 
     # 12. Education Match (if specified in JD)
     if 'masters' in jd_education or 'phd' in jd_education:
         resume_edu = analysis_results.get('resume_education', [])
         if 'masters' in jd_education and 'masters' not in resume_edu and 'phd' not in resume_edu:
-            suggestions.append({
-                'type': 'info',
-                'category': 'Education',
-                'message': 'This position may prefer advanced degrees. Emphasize relevant coursework, certifications, and hands-on project experience.'
-            })
+            suggestions.append(_ADVANCED_DEGREE_SUGGESTION)
 
     return suggestions
 
 
 def get_score_category(score):
     """Get category label and CSS class for match score"""
-    if score >= 80:
-        return 'Excellent', 'success'
-    elif score >= 60:
-        return 'Good', 'info'
-    elif score >= 40:
-        return 'Fair', 'warning'
-    else:
-        return 'Needs Work', 'danger'
+    return _SCORE_CATEGORIES[_score_bucket(score)]